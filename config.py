@@ -44,6 +44,10 @@ UNUSUAL_USER_SHARE_THRESHOLD: Final = 0.5  # 50%
 # General defaults
 DEFAULT_SLOW_ENDPOINT_THRESHOLD_MS: Final = SEVERITY_THRESHOLDS_MS["medium"]
 
+# Data validation: rows coerced per batch when ingesting (bounds peak memory
+# of the intermediate DataFrame for streamed inputs)
+VALIDATION_BATCH_SIZE: Final = 50_000
+
 # Data validation: fields we expect
 REQUIRED_FIELDS: Final = [
     "timestamp",
@@ -5,9 +5,19 @@ Core analytics + Option A (Cost Estimation) + Option B (Anomaly Detection).
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
-from collections import Counter, defaultdict
-from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+try:  # optional: faster JSON output for the CLI
+    import orjson
+except ImportError:
+    orjson = None
 
 from config import (
     SEVERITY_THRESHOLDS_MS,
@@ -24,24 +34,68 @@ from config import (
     DEFAULT_SLOW_ENDPOINT_THRESHOLD_MS,
 )
 from utils import (
-    validate_log_entry,
+    validate_logs,
+    load_logs,
+    format_ts_ns,
+    ns_to_datetime,
     aggregate_by_endpoint,
-    severity_for_response_time,
-    severity_for_error_rate,
-    hourly_bucket,
-    sliding_window_counts,
+    status_counts,
+    most_common_statuses,
+    classify_severity,
+    severity_bounds,
+    window_sums,
     timedelta_minutes,
+    NS_PER_MINUTE,
+    NS_PER_HOUR,
 )
 
+# Severity bucket boundaries, looked up with one searchsorted per column
+_RT_SEVERITY_BOUNDS = severity_bounds(SEVERITY_THRESHOLDS_MS)
+_ERR_SEVERITY_BOUNDS = severity_bounds(ERROR_RATE_THRESHOLDS_PERCENT)
+
+
+def _endpoint_table(parts: List[Dict[str, Any]]) -> pd.DataFrame:
+    # Merge the shards' per-endpoint partials, then add the per-endpoint
+    # rates and severities every report section reads
+    if len(parts) == 1:
+        table = parts[0]["table"]
+        statuses = parts[0]["statuses"]
+    else:
+        merged = pd.concat([p["table"] for p in parts])
+        table = merged.groupby(level=0, sort=True, observed=True).agg({c: _TABLE_MERGE.get(c, "sum") for c in merged.columns})
+        statuses = (
+            pd.concat([p["statuses"] for p in parts], ignore_index=True)
+            .groupby(["endpoint", "status_code"], observed=True)
+            .agg(count=("count", "sum"), first_row=("first_row", "min"))
+            .reset_index()
+        )
+    table["most_common_status"] = most_common_statuses(statuses)
+    # Shards are contiguous slices of the input, so each endpoint's row costs
+    # stay in input order when concatenated shard by shard
+    table["total_cost"] = [
+        float(np.add.accumulate(np.concatenate(costs))[-1]) for costs in _per_endpoint(parts, "costs", table.index)
+    ]
+    table["avg_rt"] = table["sum_rt"] / table["count"]
+    table["err_rate"] = table["errors"] / table["count"] * 100
+    table["rt_severity"] = classify_severity(_reported_avg(table), _RT_SEVERITY_BOUNDS)
+    table["err_severity"] = classify_severity(table["err_rate"], _ERR_SEVERITY_BOUNDS)
+    return table
+
 
-def _most_common_status(counter: Counter) -> Optional[int]:
-    if not counter:
-        return None
-    return counter.most_common(1)[0][0]
+def _per_endpoint(parts: List[Dict[str, Any]], key: str, endpoints: Iterable[str]) -> List[List[Any]]:
+    # For each endpoint, its entries under parts[i][key] in shard order
+    return [[p[key][ep] for p in parts if ep in p[key]] for ep in endpoints]
 
 
-def _calc_summary(valid_logs: List[Dict[str, Any]]) -> Dict[str, Any]:
-    total = len(valid_logs)
+def _reported_avg(table: pd.DataFrame) -> pd.Series:
+    # Average response time as the report shows it. Python round, not
+    # Series.round: NumPy rounds the binary value half-to-even, so 100.0125
+    # would come out as 100.012. Thresholds compare against this value.
+    return pd.Series([round(v, 3) for v in table["avg_rt"].tolist()], index=table.index, dtype=float)
+
+
+def _calc_summary(table: pd.DataFrame) -> Dict[str, Any]:
+    total = int(table["count"].sum())
     if total == 0:
         return {
             "total_requests": 0,
@@ -49,143 +103,185 @@ def _calc_summary(valid_logs: List[Dict[str, Any]]) -> Dict[str, Any]:
             "avg_response_time_ms": 0,
             "error_rate_percentage": 0,
         }
-    timestamps = [l["timestamp"] for l in valid_logs]
-    start = min(timestamps).isoformat().replace("+00:00", "Z")
-    end = max(timestamps).isoformat().replace("+00:00", "Z")
-    sum_rt = sum(l["response_time_ms"] for l in valid_logs)
-    avg_rt = sum_rt / total
-    errors = sum(1 for l in valid_logs if 400 <= l["status_code"] <= 599)
-    err_rate = (errors / total) * 100 if total else 0.0
+    avg_rt = table["sum_rt"].sum() / total
+    err_rate = (table["errors"].sum() / total) * 100
     return {
         "total_requests": total,
-        "time_range": {"start": start, "end": end},
-        "avg_response_time_ms": round(avg_rt, 3),
-        "error_rate_percentage": round(err_rate, 3),
+        "time_range": {"start": format_ts_ns(table["first_ts"].min()), "end": format_ts_ns(table["last_ts"].max())},
+        "avg_response_time_ms": round(float(avg_rt), 3),
+        "error_rate_percentage": round(float(err_rate), 3),
     }
 
 
-def _calc_endpoint_stats(valid_logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    by_ep = aggregate_by_endpoint(valid_logs)
-    stats: List[Dict[str, Any]] = []
-    for ep, s in by_ep.items():
-        avg_ms = (s["sum_rt"] / s["count"]) if s["count"] else 0
-        stats.append(
-            {
-                "endpoint": ep,
-                "request_count": s["count"],
-                "avg_response_time_ms": round(avg_ms, 3),
-                "slowest_request_ms": int(s["slowest"]) if s["slowest"] != float("-inf") else 0,
-                "fastest_request_ms": int(s["fastest"]) if s["fastest"] != float("inf") else 0,
-                "error_count": s["error_count"],
-                "most_common_status": _most_common_status(s["status_counter"]),
-            }
+def _calc_endpoint_stats(table: pd.DataFrame) -> List[Dict[str, Any]]:
+    # Columns are converted to Python scalars once, not per row
+    cols = ["count", "avg_rt", "max_rt", "min_rt", "errors", "most_common_status"]
+    return [
+        {
+            "endpoint": ep,
+            "request_count": count,
+            "avg_response_time_ms": round(avg_rt, 3),
+            "slowest_request_ms": max_rt,
+            "fastest_request_ms": min_rt,
+            "error_count": errors,
+            "most_common_status": status,
+        }
+        for ep, (count, avg_rt, max_rt, min_rt, errors, status) in zip(
+            table.index, zip(*(table[c].tolist() for c in cols))
         )
-    stats.sort(key=lambda x: x["endpoint"])
-    return stats
+    ]
+
 
+def _flagged_endpoints(table: pd.DataFrame) -> pd.DataFrame:
+    # Endpoints that are slow or erroring; the medium severity threshold is
+    # also the recommendation threshold, so both sections share this mask
+    return table[table["rt_severity"].notna() | table["err_severity"].notna()]
 
-def _detect_performance_issues(endpoint_stats: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+
+def _detect_performance_issues(table: pd.DataFrame) -> List[Dict[str, Any]]:
     issues: List[Dict[str, Any]] = []
-    for s in endpoint_stats:
-        sev = severity_for_response_time(s["avg_response_time_ms"], SEVERITY_THRESHOLDS_MS)
-        if sev:
+    for ep, row in _flagged_endpoints(table).iterrows():
+        if pd.notna(row["rt_severity"]):
             issues.append(
                 {
                     "type": "slow_endpoint",
-                    "endpoint": s["endpoint"],
-                    "avg_response_time_ms": s["avg_response_time_ms"],
+                    "endpoint": ep,
+                    "avg_response_time_ms": round(float(row["avg_rt"]), 3),
                     "threshold_ms": DEFAULT_SLOW_ENDPOINT_THRESHOLD_MS,
-                    "severity": sev,
+                    "severity": row["rt_severity"],
                 }
             )
         # Error rate severity per endpoint
-        total = s["request_count"]
-        err_rate = (s["error_count"] / total * 100) if total else 0.0
-        err_sev = severity_for_error_rate(err_rate, ERROR_RATE_THRESHOLDS_PERCENT)
-        if err_sev:
+        if pd.notna(row["err_severity"]):
             issues.append(
                 {
                     "type": "high_error_rate",
-                    "endpoint": s["endpoint"],
-                    "error_rate_percentage": round(err_rate, 3),
-                    "severity": err_sev,
+                    "endpoint": ep,
+                    "error_rate_percentage": round(float(row["err_rate"]), 3),
+                    "severity": row["err_severity"],
                 }
             )
     return issues
 
 
-def _recommendations(summary: Dict[str, Any], endpoint_stats: List[Dict[str, Any]]) -> List[str]:
+def _recommendations(table: pd.DataFrame) -> List[str]:
     recs: List[str] = []
     # Caching recommendation for frequent GET endpoints will be finalized in Option D (ignored here),
     # but we can still suggest investigating slow endpoints and high error rate ones.
-    for s in endpoint_stats:
-        if s["avg_response_time_ms"] > SEVERITY_THRESHOLDS_MS["medium"]:
+    for ep, row in _flagged_endpoints(table).iterrows():
+        if pd.notna(row["rt_severity"]):
             recs.append(
-                f"Investigate {s['endpoint']} performance (avg {s['avg_response_time_ms']}ms exceeds {SEVERITY_THRESHOLDS_MS['medium']}ms threshold)"
+                f"Investigate {ep} performance (avg {round(float(row['avg_rt']), 3)}ms exceeds {SEVERITY_THRESHOLDS_MS['medium']}ms threshold)"
             )
-        total = s["request_count"]
-        err_rate = (s["error_count"] / total * 100) if total else 0.0
-        if err_rate > ERROR_RATE_THRESHOLDS_PERCENT["medium"]:
-            recs.append(f"Alert: {s['endpoint']} has {round(err_rate,3)}% error rate")
+        if pd.notna(row["err_severity"]):
+            recs.append(f"Alert: {ep} has {round(float(row['err_rate']), 3)}% error rate")
     return recs
 
 
-def _hourly_distribution(valid_logs: List[Dict[str, Any]]) -> Dict[str, int]:
-    dist: Dict[str, int] = defaultdict(int)
-    for l in valid_logs:
-        dist[hourly_bucket(l["timestamp"])] += 1
-    return dict(sorted(dist.items()))
+def _hour_counts(df: pd.DataFrame) -> np.ndarray:
+    hours = df["timestamp_ns"].to_numpy() // NS_PER_HOUR % 24
+    return np.bincount(hours, minlength=24)
 
 
-def _top_users(valid_logs: List[Dict[str, Any]], top_n: int = 5) -> List[Dict[str, Any]]:
-    c = Counter(l["user_id"] for l in valid_logs)
-    return [{"user_id": uid, "request_count": cnt} for uid, cnt in c.most_common(top_n)]
+def _hourly_distribution(counts: np.ndarray) -> Dict[str, int]:
+    return {f"{h:02d}:00": int(c) for h, c in enumerate(counts) if c}
+
+
+def _user_counts(df: pd.DataFrame) -> pd.DataFrame:
+    # Requests per user, with the input position (the frame's index) of each
+    # user's first row. Ordering users on that position makes ties resolve
+    # like Counter.most_common over the rows in input order, in one shard or
+    # across several.
+    return (
+        df.assign(row=df.index)
+        .groupby("user_id", observed=True)
+        .agg(count=("row", "size"), first_row=("row", "min"))
+        .reset_index()
+    )
+
+
+def _merge_user_counts(parts: List[pd.DataFrame]) -> Tuple[List[str], np.ndarray]:
+    # A user can appear in several shards: order by first input position
+    # and sum the counts
+    merged = pd.concat(parts, ignore_index=True).sort_values("first_row", kind="stable")
+    counts = merged.groupby("user_id", sort=False, observed=True)["count"].sum()
+    return list(counts.index), counts.to_numpy()
+
+
+def _top_users(users: List[str], counts: np.ndarray, top_n: int = 5) -> List[Dict[str, Any]]:
+    candidates = np.arange(counts.size)
+    if counts.size > top_n:
+        # Everyone tied with the n-th largest count, so ties settle by first input position
+        kth = np.partition(counts, counts.size - top_n)[counts.size - top_n]
+        candidates = np.flatnonzero(counts >= kth)
+    top = candidates[np.lexsort((candidates, -counts[candidates]))][:top_n]
+    return [{"user_id": users[i], "request_count": int(counts[i])} for i in top]
 
 
 # Option A: Cost Estimation
-def _memory_cost(bytes_count: int) -> float:
-    for low, high, cost in MEMORY_COST_BRACKETS:
-        if low <= bytes_count < high:
-            return cost
-    return 0.0
-
-
-def _cost_analysis(valid_logs: List[Dict[str, Any]], endpoint_stats: List[Dict[str, Any]]) -> Dict[str, Any]:
-    total_request_cost = len(valid_logs) * COST_PER_REQUEST_USD
-    total_execution_cost = sum(l["response_time_ms"] * COST_PER_MS_EXECUTION_USD for l in valid_logs)
-    total_memory_cost = sum(_memory_cost(l["response_size_bytes"]) for l in valid_logs)
-
-    cost_by_ep_map: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"count": 0, "total_cost": 0.0})
-    for l in valid_logs:
-        ep = l["endpoint"]
-        per_req = COST_PER_REQUEST_USD
-        exec_cost = l["response_time_ms"] * COST_PER_MS_EXECUTION_USD
-        mem_cost = _memory_cost(l["response_size_bytes"])
-        total = per_req + exec_cost + mem_cost
-        cost_by_ep_map[ep]["count"] += 1
-        cost_by_ep_map[ep]["total_cost"] += total
-
-    cost_by_endpoint: List[Dict[str, Any]] = []
-    for ep, data in sorted(cost_by_ep_map.items()):
-        per_request = data["total_cost"] / data["count"] if data["count"] else 0.0
-        cost_by_endpoint.append(
-            {
-                "endpoint": ep,
-                "total_cost": round(data["total_cost"], 6),
-                "cost_per_request": round(per_request, 6),
-            }
-        )
+# Bracket upper bounds and their costs, looked up with one searchsorted per column
+_MEMORY_COST_BOUNDS = np.array([high for _, high, _ in MEMORY_COST_BRACKETS[:-1]])
+_MEMORY_COSTS = np.array([cost for _, _, cost in MEMORY_COST_BRACKETS])
+
+
+_MEMORY_BRACKET_COLUMNS = [f"mem_bracket_{i}" for i in range(len(MEMORY_COST_BRACKETS))]
+# How shard table columns merge; every other column is a count or a sum
+_TABLE_MERGE = {"min_rt": "min", "max_rt": "max", "first_ts": "min", "last_ts": "max"}
+
+
+def _endpoint_aggregates(df: pd.DataFrame) -> pd.DataFrame:
+    # aggregate_by_endpoint plus requests per memory bracket, which keep the
+    # report's memory total a sum of integers with the cost factors applied once
+    table = aggregate_by_endpoint(df)
+    codes = df["endpoint"].cat.codes.to_numpy()
+    brackets = np.searchsorted(_MEMORY_COST_BOUNDS, df["response_size_bytes"].to_numpy(), side="right")
+    n_categories = len(df["endpoint"].cat.categories)
+    bracket_counts = np.bincount(
+        codes * _MEMORY_COSTS.size + brackets, minlength=n_categories * _MEMORY_COSTS.size
+    ).reshape(n_categories, _MEMORY_COSTS.size)[np.unique(codes)]
+    for i, column in enumerate(_MEMORY_BRACKET_COLUMNS):
+        table[column] = bracket_counts[:, i]
+    return table
+
+
+def _endpoint_row_costs(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    # Each row's cost, per endpoint in input order. The endpoint's total is
+    # accumulated row by row in that order: summing in any other order can
+    # move cost_per_request in the 6th decimal.
+    codes = df["endpoint"].cat.codes.to_numpy()
+    order = np.lexsort((df.index.to_numpy(), codes))
+    codes = codes[order]
+    brackets = np.searchsorted(_MEMORY_COST_BOUNDS, df["response_size_bytes"].to_numpy()[order], side="right")
+    row_cost = (
+        COST_PER_REQUEST_USD + df["response_time_ms"].to_numpy()[order] * COST_PER_MS_EXECUTION_USD
+    ) + _MEMORY_COSTS[brackets]
+    ep_codes, starts = np.unique(codes, return_index=True)
+    ends = np.append(starts[1:], codes.size)
+    endpoints = df["endpoint"].cat.categories[ep_codes]
+    return {ep: row_cost[a:b] for ep, a, b in zip(endpoints, starts, ends)}
+
+
+def _cost_analysis(table: pd.DataFrame) -> Dict[str, Any]:
+    total_request_cost = int(table["count"].sum()) * COST_PER_REQUEST_USD
+    total_execution_cost = int(table["sum_rt"].sum()) * COST_PER_MS_EXECUTION_USD
+    total_memory_cost = sum(
+        int(table[column].sum()) * cost for column, cost in zip(_MEMORY_BRACKET_COLUMNS, _MEMORY_COSTS.tolist())
+    )
+
+    ep_total = table["total_cost"]
+    ep_per_request = ep_total / table["count"]
+    cost_by_endpoint: List[Dict[str, Any]] = [
+        {"endpoint": ep, "total_cost": round(total, 6), "cost_per_request": round(per_request, 6)}
+        for ep, total, per_request in zip(table.index, ep_total.tolist(), ep_per_request.tolist())
+    ]
 
     total_cost = total_request_cost + total_execution_cost + total_memory_cost
 
     # Simple optimization potential heuristic:
     # If endpoints with avg_response_time_ms > medium threshold were reduced to medium threshold,
     # potential savings equals reduction in execution cost proportional to time overage.
-    potential_savings = 0.0
-    for s in endpoint_stats:
-        if s["avg_response_time_ms"] > SEVERITY_THRESHOLDS_MS["medium"]:
-            over = s["avg_response_time_ms"] - SEVERITY_THRESHOLDS_MS["medium"]
-            potential_savings += over * COST_PER_MS_EXECUTION_USD * s["request_count"]
+    over = (_reported_avg(table) - SEVERITY_THRESHOLDS_MS["medium"]).clip(lower=0)
+    potential_savings = float((over * COST_PER_MS_EXECUTION_USD * table["count"]).sum())
 
     return {
         "total_cost_usd": round(total_cost, 6),
@@ -200,142 +296,277 @@ def _cost_analysis(valid_logs: List[Dict[str, Any]], endpoint_stats: List[Dict[s
 
 
 # Option B: Anomaly Detection
-def _anomalies(valid_logs: List[Dict[str, Any]], endpoint_stats: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    anomalies: List[Dict[str, Any]] = []
-    if not valid_logs:
-        return anomalies
+# Per-endpoint activity as run-length minute bins: absolute minute ids with
+# the request and error counts in each
+EndpointActivity = Tuple[np.ndarray, np.ndarray, np.ndarray]
+# Per-endpoint rows in time order: epoch-ns timestamps and response times
+EndpointResponseTimes = Tuple[np.ndarray, np.ndarray]
+EndpointSeries = Tuple[str, np.ndarray, np.ndarray, np.ndarray, int, int, int]
+
+
+def _endpoint_activity(
+    df: pd.DataFrame,
+) -> Tuple[Dict[str, EndpointActivity], Dict[str, EndpointResponseTimes]]:
+    # Everything the anomaly checks need from the rows of each endpoint:
+    # its minute bins, plus its time-ordered response times for the
+    # degradation check
+    if df.empty:
+        return {}, {}
+
+    # Rows are time-ordered from validation; a stable sort by endpoint code
+    # makes each endpoint one contiguous, still time-ordered slice
+    codes = df["endpoint"].cat.codes.to_numpy()
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+    ts = df["timestamp_ns"].to_numpy()[order]
+    minutes = ts // NS_PER_MINUTE
+    rt = df["response_time_ms"].to_numpy()[order]
+    is_error = df["is_error"].to_numpy()[order]
+    ep_codes, starts = np.unique(codes, return_index=True)
+    ends = np.append(starts[1:], codes.size)
+    endpoints = list(df["endpoint"].cat.categories[ep_codes])
+
+    # A new run starts wherever the endpoint or the minute changes
+    new_run = np.ones(codes.size, dtype=bool)
+    new_run[1:] = (codes[1:] != codes[:-1]) | (minutes[1:] != minutes[:-1])
+    run_starts = np.flatnonzero(new_run)
+    requests = np.diff(np.append(run_starts, codes.size))
+    errors = np.add.reduceat(is_error.astype(np.int64), run_starts)
+    bounds = np.append(np.searchsorted(run_starts, starts), run_starts.size)
+
+    activity = {
+        ep: (minutes[run_starts[a:b]], requests[a:b], errors[a:b])
+        for ep, a, b in zip(endpoints, bounds[:-1], bounds[1:])
+    }
+    response_times = {ep: (ts[a:b], rt[a:b]) for ep, a, b in zip(endpoints, starts, ends)}
+    return activity, response_times
+
+
+def _merge_activity(pieces: List[EndpointActivity]) -> EndpointActivity:
+    # One endpoint's minute bins from several shards: sum the counts per minute
+    if len(pieces) == 1:
+        return pieces[0]
+    minutes, inverse = np.unique(np.concatenate([m for m, _, _ in pieces]), return_inverse=True)
+    requests = np.bincount(inverse, weights=np.concatenate([r for _, r, _ in pieces]), minlength=minutes.size)
+    errors = np.bincount(inverse, weights=np.concatenate([e for _, _, e in pieces]), minlength=minutes.size)
+    return minutes, requests.astype(np.int64), errors.astype(np.int64)
+
+
+def _merge_response_times(pieces: List[EndpointResponseTimes]) -> np.ndarray:
+    # One endpoint's response times from several shards, back in time order.
+    # Shards are contiguous slices of the input, so a stable sort keeps
+    # equal timestamps in input order.
+    if len(pieces) == 1:
+        return pieces[0][1]
+    ts = np.concatenate([t for t, _ in pieces])
+    rt = np.concatenate([r for _, r in pieces])
+    return rt[np.argsort(ts, kind="stable")]
+
+
+def _detect_endpoint_anomalies(series: EndpointSeries) -> Tuple[List[Dict[str, Any]], ...]:
+    # Spikes and error clusters for one endpoint, from plain NumPy: the
+    # endpoint's minute bins, request count and time span (ns), plus the
+    # shared bucket origin (absolute minute).
+    ep, minutes, requests, errors, count, span_ns, t0_minute = series
+    spikes: List[Dict[str, Any]] = []
+    clusters: List[Dict[str, Any]] = []
+
+    # Request spikes using 5-minute windows vs average window rate. A window
+    # sum only grows when a new occupied minute enters it, so the first
+    # crossing window always ends on an occupied minute: it is enough to
+    # check the windows ending there (starting no earlier than t0_minute).
+    starts = np.maximum(minutes - (REQUEST_SPIKE_WINDOW_MINUTES - 1), t0_minute)
+    rolling = window_sums(minutes, requests, starts, REQUEST_SPIKE_WINDOW_MINUTES)
+    # Normal average rate per 5 minutes = total_requests / (total_duration_minutes/5)
+    duration_minutes = max(1, int(span_ns // NS_PER_MINUTE) or 1)
+    windows = max(1, duration_minutes / REQUEST_SPIKE_WINDOW_MINUTES)
+    normal_rate = count / windows
+    spiking = rolling > REQUEST_SPIKE_MULTIPLIER * normal_rate
+    if spiking.any():
+        # report first spike, stamped with the start of its window
+        i = int(np.argmax(spiking))
+        actual = int(rolling[i])
+        spikes.append(
+            {
+                "type": "request_spike",
+                "endpoint": ep,
+                "timestamp": format_ts_ns(int(starts[i]) * NS_PER_MINUTE),
+                "normal_rate": int(normal_rate),
+                "actual_rate": actual,
+                "severity": "high" if actual > 2 * REQUEST_SPIKE_MULTIPLIER * normal_rate else "medium",
+            }
+        )
 
-    # Request spikes per endpoint using 5-minute sliding window vs global average rate
-    by_endpoint_ts: Dict[str, List[datetime]] = defaultdict(list)
-    for l in valid_logs:
-        by_endpoint_ts[l["endpoint"]].append(l["timestamp"])
-    for ep, ts_list in by_endpoint_ts.items():
-        ts_list.sort()
-        # Normal average rate per 5 minutes = total_requests / (total_duration_minutes/5)
-        duration_minutes = max(1, int((max(ts_list) - min(ts_list)).total_seconds() // 60) or 1)
-        windows = max(1, duration_minutes / REQUEST_SPIKE_WINDOW_MINUTES)
-        normal_rate = len(ts_list) / windows
-        for t, count in sliding_window_counts(ts_list, REQUEST_SPIKE_WINDOW_MINUTES):
-            if count > REQUEST_SPIKE_MULTIPLIER * normal_rate and count >= 1:
-                anomalies.append(
-                    {
-                        "type": "request_spike",
-                        "endpoint": ep,
-                        "timestamp": t.isoformat().replace("+00:00", "Z"),
-                        "normal_rate": int(normal_rate),
-                        "actual_rate": int(count),
-                        "severity": "high" if count > 2 * REQUEST_SPIKE_MULTIPLIER * normal_rate else "medium",
-                    }
-                )
-                break  # report first spike
-
-    # Response time degradation: compare recent average vs overall endpoint average
-    # Use last 10% of logs for endpoint as "recent"
-    by_endpoint_logs: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-    for l in valid_logs:
-        by_endpoint_logs[l["endpoint"]].append(l)
-    for ep, logs in by_endpoint_logs.items():
-        logs.sort(key=lambda x: x["timestamp"])
-        n = len(logs)
-        if n < 5:
-            continue
-        recent = logs[max(0, int(n * 0.9)) :]
-        recent_avg = sum(x["response_time_ms"] for x in recent) / len(recent)
-        overall_avg = sum(x["response_time_ms"] for x in logs) / n
-        if recent_avg > RESPONSE_DEGRADATION_MULTIPLIER * overall_avg and recent_avg > SEVERITY_THRESHOLDS_MS["medium"]:
-            anomalies.append(
+    # Error clusters: > 10 errors within a 5-minute window
+    if errors.any():
+        occupied = errors > 0
+        minutes, errors = minutes[occupied], errors[occupied]
+        starts = np.maximum(minutes - (ERROR_CLUSTER_WINDOW_MINUTES - 1), t0_minute)
+        rolling = window_sums(minutes, errors, starts, ERROR_CLUSTER_WINDOW_MINUTES)
+        clustered = rolling >= ERROR_CLUSTER_THRESHOLD
+        if clustered.any():
+            i = int(np.argmax(clustered))
+            error_count = int(rolling[i])
+            start = ns_to_datetime(int(starts[i]) * NS_PER_MINUTE)
+            end = start + timedelta_minutes(ERROR_CLUSTER_WINDOW_MINUTES)
+            clusters.append(
                 {
-                    "type": "response_time_degradation",
+                    "type": "error_cluster",
                     "endpoint": ep,
-                    "recent_avg_ms": round(recent_avg, 3),
-                    "overall_avg_ms": round(overall_avg, 3),
-                    "severity": "high" if recent_avg > RESPONSE_DEGRADATION_MULTIPLIER * overall_avg * 1.5 else "medium",
+                    "time_window": f"{start.strftime('%H:%M')}-{end.strftime('%H:%M')}",
+                    "error_count": error_count,
+                    "severity": "critical" if error_count >= ERROR_CLUSTER_THRESHOLD * 2 else "high",
                 }
             )
 
-    # Error clusters: > 10 errors within a 5-minute window
-    error_ts: Dict[str, List[datetime]] = defaultdict(list)
-    for l in valid_logs:
-        if 400 <= l["status_code"] <= 599:
-            error_ts[l["endpoint"]].append(l["timestamp"])
-    for ep, ts_list in error_ts.items():
-        ts_list.sort()
-        for t, count in sliding_window_counts(ts_list, ERROR_CLUSTER_WINDOW_MINUTES):
-            if count >= ERROR_CLUSTER_THRESHOLD:
-                anomalies.append(
-                    {
-                        "type": "error_cluster",
-                        "endpoint": ep,
-                        "time_window": f"{(t - timedelta_minutes(ERROR_CLUSTER_WINDOW_MINUTES)).strftime('%H:%M')}-{t.strftime('%H:%M')}",
-                        "error_count": int(count),
-                        "severity": "critical" if count >= ERROR_CLUSTER_THRESHOLD * 2 else "high",
-                    }
-                )
-                break
+    return spikes, clusters
+
+
+def _degradations(endpoints: List[str], rt: np.ndarray, starts: np.ndarray, sizes: np.ndarray) -> List[Dict[str, Any]]:
+    # Response time degradation: compare recent average vs overall endpoint average.
+    # rt holds contiguous time-ordered endpoint slices [start, start + size); the
+    # last 10% of each slice is "recent". Both sums come from one cumulative sum.
+    csum = np.concatenate(([0], np.cumsum(rt)))
+    ends = starts + sizes
+    recent_starts = starts + sizes * 9 // 10
+    overall_avg = (csum[ends] - csum[starts]) / sizes
+    recent_avg = (csum[ends] - csum[recent_starts]) / (ends - recent_starts)
+    degraded = (
+        (sizes >= 5)
+        & (recent_avg > RESPONSE_DEGRADATION_MULTIPLIER * overall_avg)
+        & (recent_avg > SEVERITY_THRESHOLDS_MS["medium"])
+    )
+    return [
+        {
+            "type": "response_time_degradation",
+            "endpoint": endpoints[i],
+            "recent_avg_ms": round(float(recent_avg[i]), 3),
+            "overall_avg_ms": round(float(overall_avg[i]), 3),
+            "severity": "high" if recent_avg[i] > RESPONSE_DEGRADATION_MULTIPLIER * overall_avg[i] * 1.5 else "medium",
+        }
+        for i in np.flatnonzero(degraded)
+    ]
+
+
+def _anomalies(
+    table: pd.DataFrame,
+    activity: Dict[str, EndpointActivity],
+    response_times: List[np.ndarray],
+    user_counts: Tuple[List[str], np.ndarray],
+) -> List[Dict[str, Any]]:
+    anomalies: List[Dict[str, Any]] = []
+    if table.empty:
+        return anomalies
+
+    # Minute buckets aligned to the wall clock, shared by every endpoint
+    t0_minute = int(table["first_ts"].min() // NS_PER_MINUTE)
+
+    series: List[EndpointSeries] = [
+        (ep, *activity[ep], int(row["count"]), int(row["last_ts"] - row["first_ts"]), t0_minute)
+        for ep, row in table[["count", "first_ts", "last_ts"]].iterrows()
+    ]
+    results = list(map(_detect_endpoint_anomalies, series))
+    # Keep the report grouped by anomaly type: spikes, degradations, clusters
+    for spikes, _ in results:
+        anomalies.extend(spikes)
+    sizes = table["count"].to_numpy()
+    anomalies.extend(_degradations(list(table.index), np.concatenate(response_times), np.cumsum(sizes) - sizes, sizes))
+    for _, clusters in results:
+        anomalies.extend(clusters)
 
     # Unusual user behavior: single user > 50% of total requests
-    total = len(valid_logs)
-    user_counts = Counter(l["user_id"] for l in valid_logs)
-    if total > 0:
-        user_id, cnt = user_counts.most_common(1)[0]
-        share = cnt / total
-        if share > UNUSUAL_USER_SHARE_THRESHOLD:
-            anomalies.append(
-                {
-                    "type": "unusual_user_behavior",
-                    "user_id": user_id,
-                    "share_percentage": round(share * 100, 3),
-                    "severity": "high" if share > 0.7 else "medium",
-                }
-            )
+    users, counts = user_counts
+    top = int(np.argmax(counts))
+    share = counts[top] / counts.sum()
+    if share > UNUSUAL_USER_SHARE_THRESHOLD:
+        anomalies.append(
+            {
+                "type": "unusual_user_behavior",
+                "user_id": users[top],
+                "share_percentage": round(float(share) * 100, 3),
+                "severity": "high" if share > 0.7 else "medium",
+            }
+        )
 
     return anomalies
 
 
-def analyze_api_logs(logs: List[Dict[str, Any]]) -> Dict[str, Any]:
-    # Validate and normalize logs
-    valid_logs: List[Dict[str, Any]] = []
-    for entry in logs or []:
-        v = validate_log_entry(entry)
-        if v:
-            valid_logs.append(v)
+def _analyze_shard(logs: Iterable[Dict[str, Any]], offset: int = 0) -> Dict[str, Any]:
+    # Partials for a contiguous slice of the input starting at position
+    # offset. Each piece merges with other slices' partials, so slices can
+    # run in separate processes.
+    df = validate_logs(logs)
+    df.index += offset
+    activity, response_times = _endpoint_activity(df)
+    return {
+        "table": _endpoint_aggregates(df),
+        "statuses": status_counts(df),
+        "costs": _endpoint_row_costs(df),
+        "hours": _hour_counts(df),
+        "users": _user_counts(df),
+        "activity": activity,
+        "response_times": response_times,
+    }
 
-    # Core outputs
-    summary = _calc_summary(valid_logs)
-    endpoint_stats = _calc_endpoint_stats(valid_logs)
-    performance_issues = _detect_performance_issues(endpoint_stats)
-    recommendations = _recommendations(summary, endpoint_stats)
-    hourly_distribution = _hourly_distribution(valid_logs)
-    top_users_by_requests = _top_users(valid_logs, 5)
 
-    # Advanced features
-    cost_analysis = _cost_analysis(valid_logs, endpoint_stats)
-    anomalies = _anomalies(valid_logs, endpoint_stats)
+def _finalize(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Merge the partials (in input order) and build the report from them:
+    # per-endpoint entries merge endpoint by endpoint, hourly and per-user
+    # counts are summed
+    parts = [p for p in parts if not p["table"].empty] or parts[:1]
+    table = _endpoint_table(parts)
+    hours = np.sum([p["hours"] for p in parts], axis=0)
+    user_counts = _merge_user_counts([p["users"] for p in parts])
+    activity = dict(zip(table.index, map(_merge_activity, _per_endpoint(parts, "activity", table.index))))
+    response_times = list(map(_merge_response_times, _per_endpoint(parts, "response_times", table.index)))
 
     return {
-        "summary": summary,
-        "endpoint_stats": endpoint_stats,
-        "performance_issues": performance_issues,
-        "recommendations": recommendations,
-        "hourly_distribution": hourly_distribution,
-        "top_users_by_requests": top_users_by_requests,
-        "cost_analysis": cost_analysis,
-        "anomalies": anomalies,
+        # Core outputs
+        "summary": _calc_summary(table),
+        "endpoint_stats": _calc_endpoint_stats(table),
+        "performance_issues": _detect_performance_issues(table),
+        "recommendations": _recommendations(table),
+        "hourly_distribution": _hourly_distribution(hours),
+        "top_users_by_requests": _top_users(*user_counts, 5),
+        # Advanced features
+        "cost_analysis": _cost_analysis(table),
+        "anomalies": _anomalies(table, activity, response_times, user_counts),
     }
 
 
+def analyze_api_logs(logs: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    return _finalize([_analyze_shard(logs)])
+
+
+def analyze_api_logs_parallel(logs: Iterable[Dict[str, Any]], workers: Optional[int] = None) -> Dict[str, Any]:
+    # Same report as analyze_api_logs, with validation and aggregation split
+    # across processes. The input is cut into one contiguous slice per
+    # worker; workers return mergeable partials and the parent merges them.
+    logs = list(logs)
+    workers = min(workers or os.cpu_count() or 1, len(logs))
+    if workers <= 1:
+        return analyze_api_logs(logs)
+    size = math.ceil(len(logs) / workers)
+    offsets = range(0, len(logs), size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parts = list(executor.map(_analyze_shard, [logs[o:o + size] for o in offsets], offsets))
+    return _finalize(parts)
+
+
+def dumps_report(result: Dict[str, Any]) -> str:
+    # Indented JSON for the CLI; orjson when installed (NumPy-aware, much faster)
+    if orjson is not None:
+        return orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(result, indent=2)
+
+
 # Simple CLI usage to test with a JSON file:
 if __name__ == "__main__":
-    import json
     import sys
 
     if len(sys.argv) != 2:
         print("Usage: python function.py <path_to_json_logs>")
         sys.exit(1)
 
-    path = sys.argv[1]
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    result = analyze_api_logs(data)
-    print(json.dumps(result, indent=2))
+    result = analyze_api_logs(load_logs(sys.argv[1]))
+    print(dumps_report(result))
@@ -1,6 +1,12 @@
 import json
-import random
-from datetime import datetime, timedelta
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 def generate_logs(num_entries=10000):
     start_time = datetime.strptime("2025-01-15T10:00:00Z", "%Y-%m-%dT%H:%M:%SZ")
@@ -39,45 +45,66 @@ def generate_logs(num_entries=10000):
 
     endpoints_list = list(endpoints_config.keys())
     weights = [0.4, 0.2, 0.2, 0.2] # Distribution probability
-    logs = []
+    rng = np.random.default_rng()
 
     print(f"Generating {num_entries} logs...")
 
-    for i in range(num_entries):
-        # Timestamp increments by 1 second per log
-        current_time = start_time + timedelta(seconds=i)
-        timestamp_str = current_time.strftime("%Y-%m-%dT%H:%M:%SZ")
-        
-        # User ID cycles from u1 to u10
-        user_id = f"u{(i % 10) + 1}"
-        
-        # Select endpoint based on weights
-        endpoint = random.choices(endpoints_list, weights=weights, k=1)[0]
+    # Timestamp increments by 1 second per log
+    seconds = np.arange(num_entries).astype("timedelta64[s]")
+    timestamps = np.char.add(np.datetime_as_string(np.datetime64(start_time, "s") + seconds, unit="s"), "Z")
+
+    # User ID cycles from u1 to u10
+    user_ids = np.char.add("u", (np.arange(num_entries) % 10 + 1).astype(str))
+
+    # Select endpoints based on weights, then draw each column per endpoint
+    ep_idx = rng.choice(len(endpoints_list), size=num_entries, p=weights)
+    resp_times = np.empty(num_entries, dtype=np.int64)
+    req_sizes = np.empty(num_entries, dtype=np.int64)
+    resp_sizes = np.empty(num_entries, dtype=np.int64)
+    error_rates = np.empty(num_entries)
+    for k, endpoint in enumerate(endpoints_list):
         config = endpoints_config[endpoint]
-        
-        # Determine status code
-        if random.random() < config["error_rate"]:
-            status_code = 500
-        else:
-            status_code = 200
-            
-        log_entry = {
-            "timestamp": timestamp_str,
-            "endpoint": endpoint,
-            "method": config["method"],
-            "response_time_ms": random.randint(*config["resp_time_range"]),
-            "status_code": status_code,
+        mask = ep_idx == k
+        count = int(mask.sum())
+        resp_times[mask] = rng.integers(config["resp_time_range"][0], config["resp_time_range"][1] + 1, size=count)
+        req_sizes[mask] = rng.integers(config["req_size_range"][0], config["req_size_range"][1] + 1, size=count)
+        resp_sizes[mask] = rng.integers(config["resp_size_range"][0], config["resp_size_range"][1] + 1, size=count)
+        error_rates[mask] = config["error_rate"]
+
+    # Determine status codes
+    status_codes = np.where(rng.random(num_entries) < error_rates, 500, 200)
+
+    methods = [endpoints_config[ep]["method"] for ep in endpoints_list]
+    logs = [
+        {
+            "timestamp": ts,
+            "endpoint": endpoints_list[k],
+            "method": methods[k],
+            "response_time_ms": rt,
+            "status_code": status,
             "user_id": user_id,
-            "request_size_bytes": random.randint(*config["req_size_range"]),
-            "response_size_bytes": random.randint(*config["resp_size_range"])
+            "request_size_bytes": req,
+            "response_size_bytes": resp,
         }
-        
-        logs.append(log_entry)
+        for ts, k, rt, status, user_id, req, resp in zip(
+            timestamps.tolist(),
+            ep_idx.tolist(),
+            resp_times.tolist(),
+            status_codes.tolist(),
+            user_ids.tolist(),
+            req_sizes.tolist(),
+            resp_sizes.tolist(),
+        )
+    ]
 
     # Write to file
     output_file = "sample_large.json"
-    with open(output_file, "w") as f:
-        json.dump(logs, f, indent=2)
+    if orjson is not None:
+        with open(output_file, "wb") as f:
+            f.write(orjson.dumps(logs, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, "w") as f:
+            json.dump(logs, f, indent=2)
     
     print(f"Success! {num_entries} logs saved to {output_file}")
 
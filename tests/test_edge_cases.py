@@ -88,3 +88,198 @@ def test_error_rate_severity_levels():
     issues = [i for i in result["performance_issues"] if i["type"] == "high_error_rate" and i["endpoint"] == "/api/payments"]
     assert issues, "Expected high_error_rate issue"
     assert issues[0]["severity"] in {"high", "critical", "medium"}
+
+def test_numeric_strings_coerced_and_non_dicts_skipped():
+    good = {
+        "timestamp": "2025-01-15T10:00:00Z",
+        "endpoint": "/api/users",
+        "method": "get",
+        "response_time_ms": "150",
+        "status_code": 200.0,
+        "user_id": "user_1",
+        "request_size_bytes": 512,
+        "response_size_bytes": 2048,
+    }
+    result = analyze_api_logs([good, "not-a-log", None, dict(good, status_code="oops")])
+    assert result["summary"]["total_requests"] == 1
+    assert result["endpoint_stats"][0]["avg_response_time_ms"] == 150
+    assert result["endpoint_stats"][0]["most_common_status"] == 200
+
+def test_non_fixed_format_timestamps_fall_back_to_iso8601():
+    base = {
+        "endpoint": "/api/users",
+        "method": "GET",
+        "response_time_ms": 150,
+        "status_code": 200,
+        "user_id": "user_1",
+        "request_size_bytes": 512,
+        "response_size_bytes": 2048,
+    }
+    logs = [
+        dict(base, timestamp="2025-01-15T10:00:00Z"),
+        dict(base, timestamp="2025-01-15T12:30:00+02:00"),
+        dict(base, timestamp="2025-01-15T11:00:00.250Z"),
+    ]
+    result = analyze_api_logs(logs)
+    assert result["summary"]["total_requests"] == 3
+    assert result["summary"]["time_range"]["start"] == "2025-01-15T10:00:00Z"
+    assert result["summary"]["time_range"]["end"] == "2025-01-15T11:00:00.250000Z"
+
+def test_severity_buckets_exclusive_at_thresholds():
+    from config import SEVERITY_THRESHOLDS_MS
+    from utils import classify_severity, severity_bounds, severity_for_response_time
+
+    values = [500, 500.5, 1000, 1000.5, 2000, 2000.5]
+    expected = [None, "medium", "medium", "high", "high", "critical"]
+    assert [severity_for_response_time(v, SEVERITY_THRESHOLDS_MS) for v in values] == expected
+    assert list(classify_severity(values, severity_bounds(SEVERITY_THRESHOLDS_MS))) == expected
+
+def test_timestamps_outside_ns_range_skipped():
+    base = {
+        "endpoint": "/api/users",
+        "method": "GET",
+        "response_time_ms": 150,
+        "status_code": 200,
+        "user_id": "user_1",
+        "request_size_bytes": 512,
+        "response_size_bytes": 2048,
+    }
+    logs = [
+        dict(base, timestamp="2500-01-01T00:00:00Z"),
+        dict(base, timestamp="1500-01-01T00:00:00Z"),
+        dict(base, timestamp="2500-01-01T00:00:00.5+01:00"),
+        dict(base, timestamp="2025-01-15T10:00:00Z"),
+    ]
+    result = analyze_api_logs(logs)
+    assert result["summary"]["total_requests"] == 1
+    assert result["summary"]["time_range"]["start"] == "2025-01-15T10:00:00Z"
+
+def test_bool_numeric_field_coerced():
+    log = {
+        "timestamp": "2025-01-15T10:00:00Z",
+        "endpoint": "/api/users",
+        "method": "GET",
+        "response_time_ms": 150,
+        "status_code": 200,
+        "user_id": "user_1",
+        "request_size_bytes": True,
+        "response_size_bytes": 2048,
+    }
+    result = analyze_api_logs([log])
+    assert result["summary"]["total_requests"] == 1
+
+def test_compiled_validator_matches_pandas(monkeypatch):
+    import pandas as pd
+    import utils
+
+    fastcore = pytest.importorskip("_fastcore")
+    base = {
+        "timestamp": "2025-01-15T10:00:00Z",
+        "endpoint": "/api/users",
+        "method": "get",
+        "response_time_ms": 150,
+        "status_code": 200,
+        "user_id": "user_1",
+        "request_size_bytes": 512,
+        "response_size_bytes": 2048,
+    }
+    # Decided by the compiled pass (far-range timestamps go to the pandas parser)
+    handled = [
+        base,
+        dict(base, timestamp="2500-01-01T00:00:00Z"),
+        dict(base, timestamp="1500-01-01T00:00:00Z"),
+        dict(base, timestamp="2025-01-15T10:00:00.250Z"),
+        dict(base, timestamp="2025-01-15T12:30:00+02:00"),
+        dict(base, timestamp="2025-02-30T00:00:00Z"),
+        dict(base, timestamp=5),
+        dict(base, response_time_ms=150.7, status_code=True),
+        dict(base, response_time_ms=-0.5),
+        dict(base, response_time_ms=float("inf")),
+        dict(base, request_size_bytes="512", response_size_bytes=None),
+        dict(base, endpoint="", user_id=float("nan")),
+        "not-a-log",
+    ]
+    # Values whose coercion only pandas decides
+    deferred = handled + [
+        dict(base, response_time_ms=" 5 "),
+        dict(base, response_time_ms="1_000"),
+        dict(base, response_time_ms="５"),
+        dict(base, request_size_bytes=2**63 - 1),
+        dict(base, endpoint=5),
+    ]
+    assert fastcore.validate_batch(handled, tuple(utils.REQUIRED_FIELDS)) is not None
+    for batch in (handled, deferred):
+        compiled = utils.validate_logs(batch)
+        monkeypatch.setattr(utils, "_fastcore", None)
+        expected = utils.validate_logs(batch)
+        monkeypatch.setattr(utils, "_fastcore", fastcore)
+        pd.testing.assert_frame_equal(compiled, expected)
+
+def test_endpoint_average_rounds_like_summary():
+    # 8001 / 80 = 100.0125, which NumPy's half-even rounding turns into 100.012
+    base = {
+        "timestamp": "2025-01-15T10:00:00Z",
+        "endpoint": "/api/users",
+        "method": "GET",
+        "status_code": 200,
+        "user_id": "user_1",
+        "request_size_bytes": 512,
+        "response_size_bytes": 2048,
+    }
+    logs = [dict(base, response_time_ms=100) for _ in range(79)] + [dict(base, response_time_ms=101)]
+    result = analyze_api_logs(logs)
+    assert result["summary"]["avg_response_time_ms"] == 100.013
+    assert result["endpoint_stats"][0]["avg_response_time_ms"] == 100.013
+
+def test_cost_per_request_sums_rows_in_input_order():
+    # Newest first, so time order reverses the rows; summed that way the
+    # per-request cost would round to 0.00337 instead of 0.003371
+    base = {
+        "endpoint": "/api/users",
+        "method": "GET",
+        "status_code": 200,
+        "user_id": "user_1",
+        "request_size_bytes": 512,
+    }
+    rows = [(2422, 500), (1301, 500), (92, 500), (2661, 20000)]
+    logs = [
+        dict(base, timestamp=f"2025-01-15T10:0{9 - i}:00Z", response_time_ms=rt, response_size_bytes=size)
+        for i, (rt, size) in enumerate(rows)
+    ]
+    cost = analyze_api_logs(logs)["cost_analysis"]["cost_by_endpoint"][0]
+    assert cost["total_cost"] == 0.013482
+    assert cost["cost_per_request"] == 0.003371
+
+def test_text_and_int_fields_do_not_depend_on_batch_neighbours():
+    import utils
+
+    base = {
+        "timestamp": "2025-01-15T10:00:00Z",
+        "endpoint": "/api/users",
+        "method": "GET",
+        "response_time_ms": 150,
+        "status_code": 200,
+        "user_id": 101,
+        "request_size_bytes": 2**53 + 1,
+        "response_size_bytes": 2048,
+    }
+    # The null user lands in the same batch as one of the integer user_ids
+    df = utils.validate_logs([base, dict(base, user_id=None), base, base], batch_size=2)
+    assert df["user_id"].tolist() == ["101", "101", "101"]
+    assert df["request_size_bytes"].tolist() == [2**53 + 1] * 3
+
+def test_ties_resolve_by_input_order_not_time():
+    base = {
+        "endpoint": "/api/users",
+        "method": "GET",
+        "response_time_ms": 150,
+        "request_size_bytes": 512,
+        "response_size_bytes": 2048,
+    }
+    logs = [
+        dict(base, timestamp="2025-01-15T10:05:00Z", status_code=200, user_id="late"),
+        dict(base, timestamp="2025-01-15T10:00:00Z", status_code=500, user_id="early"),
+    ]
+    result = analyze_api_logs(logs)
+    assert result["endpoint_stats"][0]["most_common_status"] == 200
+    assert [u["user_id"] for u in result["top_users_by_requests"]] == ["late", "early"]
@@ -79,3 +79,105 @@ def test_performance_10k_under_2_seconds():
 
     assert result["summary"]["total_requests"] == n
     assert elapsed < 2.0, f"Processing {n} logs took {elapsed:.3f}s which exceeds 2s"
+
+def test_outlier_timestamp_does_not_inflate_anomaly_windows():
+    base = datetime(2025, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
+    logs = [make_log(base + timedelta(seconds=i), endpoint=f"/api/ep{i % 20}") for i in range(2000)]
+    logs.append(make_log(datetime(1970, 1, 1, tzinfo=timezone.utc)))
+
+    start = time.perf_counter()
+    result = analyze_api_logs(logs)
+    elapsed = time.perf_counter() - start
+
+    assert result["summary"]["time_range"]["start"] == "1970-01-01T00:00:00Z"
+    assert elapsed < 1.0, f"55 years of empty minutes took {elapsed:.3f}s"
+
+def test_request_spike_reported_at_minute_window_start():
+    base = datetime(2025, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
+    # One request a minute for an hour, plus 60 more inside 10:30
+    logs = [make_log(base + timedelta(minutes=m)) for m in range(60)]
+    logs += [make_log(base + timedelta(minutes=30, seconds=s)) for s in range(60)]
+    spikes = [a for a in analyze_api_logs(logs)["anomalies"] if a["type"] == "request_spike"]
+    assert spikes == [
+        {
+            "type": "request_spike",
+            "endpoint": "/api/users",
+            "timestamp": "2025-01-15T10:26:00Z",
+            "normal_rate": 10,
+            "actual_rate": 65,
+            "severity": "high",
+        }
+    ]
+
+def test_error_cluster_window_clamped_to_first_minute():
+    base = datetime(2025, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
+    logs = [make_log(base + timedelta(minutes=m)) for m in range(20)]
+    # Six errors in each of 10:01 and 10:02; the window cannot start before 10:00
+    logs += [make_log(base + timedelta(minutes=1 + i // 6, seconds=i), status=500) for i in range(12)]
+    clusters = [a for a in analyze_api_logs(logs)["anomalies"] if a["type"] == "error_cluster"]
+    assert clusters == [
+        {
+            "type": "error_cluster",
+            "endpoint": "/api/users",
+            "time_window": "10:00-10:05",
+            "error_count": 12,
+            "severity": "high",
+        }
+    ]
+
+def test_sharded_parallel_analysis_matches_serial():
+    from function import analyze_api_logs_parallel
+
+    with open("tests/test_data/sample_large.json", encoding="utf-8") as f:
+        logs = json.load(f)
+    logs += [{"endpoint": "/api/users"}, "not-a-log", None]
+    assert analyze_api_logs_parallel(logs, workers=3) == analyze_api_logs(logs)
+    assert analyze_api_logs_parallel([], workers=2) == analyze_api_logs([])
+
+def test_parallel_user_ties_follow_input_order():
+    from function import analyze_api_logs_parallel
+
+    # Every user ties on count and first timestamp, and each user's rows
+    # are spread over different shards
+    ts = datetime(2025, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
+    logs = [make_log(ts, endpoint=f"/api/ep{u}", user_id=f"u{u}") for _ in range(3) for u in range(7, -1, -1)]
+    serial = analyze_api_logs(logs)
+    assert [u["user_id"] for u in serial["top_users_by_requests"]] == ["u7", "u6", "u5", "u4", "u3"]
+    assert analyze_api_logs_parallel(logs, workers=4) == serial
+
+def test_parallel_merges_endpoints_split_across_shards():
+    from function import analyze_api_logs_parallel
+
+    # One endpoint spans every shard: its two statuses tie across a shard
+    # boundary and its slow tail (by time) sits in the first shard
+    base = datetime(2025, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
+    logs = [
+        make_log(base + timedelta(seconds=99 - i), rt_ms=3000 if i < 10 else 150, status=200 if i < 50 else 500)
+        for i in range(100)
+    ]
+    serial = analyze_api_logs(logs)
+    assert serial["endpoint_stats"][0]["most_common_status"] == 200
+    assert [a["type"] for a in serial["anomalies"]] == ["response_time_degradation", "error_cluster", "unusual_user_behavior"]
+    assert analyze_api_logs_parallel(logs, workers=4) == serial
+
+def test_streamed_batches_match_in_memory(monkeypatch):
+    import pandas as pd
+    import utils
+
+    path = "tests/test_data/sample_medium.json"
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    expected = utils.validate_logs(data)
+    streamed = utils.validate_logs(utils.load_logs(path), batch_size=4)
+    pd.testing.assert_frame_equal(streamed, expected)
+    monkeypatch.setattr(utils, "ijson", None)
+    assert list(utils.load_logs(path)) == data
+
+def test_report_serializes_with_and_without_orjson(monkeypatch):
+    import function
+
+    with open("tests/test_data/sample_medium.json", encoding="utf-8") as f:
+        result = analyze_api_logs(json.load(f))
+    assert json.loads(function.dumps_report(result)) == result
+    monkeypatch.setattr(function, "orjson", None)
+    assert json.loads(function.dumps_report(result)) == result
@@ -4,136 +4,292 @@ Utility helpers for validation, parsing, aggregation.
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional, Tuple
-from datetime import datetime, timezone
-from collections import defaultdict, Counter
-import math
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from bisect import bisect_left
+from itertools import islice
+import json
 
-from config import REQUIRED_FIELDS
+import numpy as np
+import pandas as pd
 
+try:  # optional: stream large JSON arrays instead of loading them whole
+    import ijson
+except ImportError:
+    ijson = None
 
-def parse_timestamp(ts: str) -> Optional[datetime]:
-    try:
-        # Expecting ISO8601 with Z
-        dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-        return dt.astimezone(timezone.utc)
-    except Exception:
-        return None
+try:  # optional: faster JSON parsing
+    import orjson
+except ImportError:
+    orjson = None
 
+try:  # optional: compiled single-pass validator, built with `cythonize -i _fastcore.pyx`
+    import _fastcore
+except ImportError:
+    _fastcore = None
 
-def is_error_status(code: int) -> bool:
-    return 400 <= code <= 599
+from config import REQUIRED_FIELDS, VALIDATION_BATCH_SIZE
 
+INT_FIELDS: Tuple[str, ...] = ("response_time_ms", "status_code", "request_size_bytes", "response_size_bytes")
+STR_FIELDS: Tuple[str, ...] = ("endpoint", "method", "user_id")
+# Validated frames carry epoch-ns timestamps instead of the raw string,
+# plus the derived error flag
+VALIDATED_FIELDS: List[str] = ["timestamp_ns", *REQUIRED_FIELDS[1:], "is_error"]
+# Strings repeated across many rows, stored dictionary-encoded
+INTERNED_FIELDS: Tuple[str, ...] = ("endpoint", "user_id")
 
-def safe_int(v: Any) -> Optional[int]:
-    try:
-        iv = int(v)
-        return iv if iv >= 0 else None
-    except Exception:
-        return None
+# The shape every log producer emits; anything else takes the ISO8601 fallback
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+NS_PER_MINUTE = 60 * 10**9
+NS_PER_HOUR = 60 * NS_PER_MINUTE
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MIN_TS = pd.Timestamp.min.tz_localize("UTC")
+_MAX_TS = pd.Timestamp.max.tz_localize("UTC")
 
-def safe_str(v: Any) -> Optional[str]:
-    try:
-        s = str(v)
-        return s if s else None
-    except Exception:
-        return None
 
+def load_logs(path: str) -> Iterator[Any]:
+    # Yield log entries from a JSON array file, streaming when ijson is available
+    with open(path, "rb") as f:
+        if ijson is not None:
+            yield from ijson.items(f, "item", use_float=True)
+        else:
+            yield from (orjson.loads if orjson is not None else json.loads)(f.read())
+
+
+def validate_logs(logs: Iterable[Any], batch_size: int = VALIDATION_BATCH_SIZE) -> pd.DataFrame:
+    # Validate and normalize raw log entries. The input is consumed in
+    # batch_size chunks, so a streamed iterable never has to be materialized
+    # as one list of dicts; the typed batches are stacked at the end and
+    # returned in timestamp order. The index is each row's position in the
+    # input: it settles ties between equal timestamps, and "first seen"
+    # tie-breaks read it instead of the time order.
+    it = iter(logs or [])
+    frames = []
+    offset = 0
+    while True:
+        batch = list(islice(it, batch_size))
+        if not batch:
+            break
+        frame = _validate_batch(batch)
+        if not frame.empty:
+            frame.index += offset
+            frames.append(frame)
+        offset += len(batch)
+    if not frames:
+        return _empty_frame()
+    out = pd.concat(frames) if len(frames) > 1 else frames[0]
+    # Sort once by time (stable, skipped when already ordered) so every
+    # per-endpoint slice downstream is time-ordered without re-sorting
+    ts = out["timestamp_ns"].to_numpy()
+    if (np.diff(ts) < 0).any():
+        out = out.iloc[np.argsort(ts, kind="stable")]
+    for f in INTERNED_FIELDS:
+        out[f] = out[f].astype("category")
+    return out
+
+
+def _validate_batch(batch: List[Any]) -> pd.DataFrame:
+    # Coerce whole columns at once and drop any row with a missing,
+    # malformed or negative field. Rows keep their position in the batch
+    # as index.
+    if _fastcore is not None:
+        out = _validate_batch_compiled(batch)
+        if out is not None:
+            return out
+    positions = [i for i, e in enumerate(batch) if isinstance(e, dict)]
+    # Object columns keep every cell as given: inferring a dtype would let
+    # one null turn the integers of the whole column into floats
+    df = pd.DataFrame([batch[i] for i in positions], index=positions, dtype=object)
+    if df.empty or not set(REQUIRED_FIELDS).issubset(df.columns):
+        return _empty_frame()
+    df = df[REQUIRED_FIELDS]
+
+    ts = _parse_timestamps(df["timestamp"])
+    ints = {f: _to_number(df[f]) for f in INT_FIELDS}
+    strs = {f: df[f].astype(str) for f in STR_FIELDS}
+
+    mask = ts.notna()
+    for f in INT_FIELDS:
+        # Non-negative and representable as int64 (rules out inf and huge values)
+        mask &= (ints[f] >= 0) & (ints[f] < 2**63)
+    for f in STR_FIELDS:
+        mask &= df[f].notna() & (strs[f] != "")
+
+    out = pd.DataFrame({"timestamp_ns": ts[mask].astype(np.int64)})
+    for f in STR_FIELDS:
+        out[f] = strs[f][mask]
+    for f in INT_FIELDS:
+        out[f] = ints[f][mask].astype(np.int64)
+    out["method"] = out["method"].str.upper()
+    out["is_error"] = out["status_code"].between(400, 599)
+    return out[VALIDATED_FIELDS]
 
-def validate_log_entry(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    # Ensure all required fields exist
-    for f in REQUIRED_FIELDS:
-        if f not in entry:
-            return None
 
-    ts = parse_timestamp(entry["timestamp"])
-    endpoint = safe_str(entry["endpoint"])
-    method = safe_str(entry["method"])
-    rt = safe_int(entry["response_time_ms"])
-    status = safe_int(entry["status_code"])
-    user = safe_str(entry["user_id"])
-    req_bytes = safe_int(entry["request_size_bytes"])
-    resp_bytes = safe_int(entry["response_size_bytes"])
+def _to_number(col: pd.Series) -> pd.Series:
+    # Truncated numeric form of a raw column, NaN where not numeric. An
+    # all-bool column stays bool under to_numeric; widen it so range checks
+    # against int64 bounds work.
+    num = pd.to_numeric(col, errors="coerce")
+    if num.dtype == bool:
+        num = num.astype(np.int64)
+    num = np.trunc(num)
+    # Floats hold integers exactly only below 2**53: re-read larger ones
+    # from integer and integer-string cells, as int() would
+    big = np.flatnonzero(num.to_numpy() >= 2**53) if num.dtype.kind == "f" else ()
+    if len(big):
+        num = num.astype(object)
+        for i in big:
+            num.iat[i] = _exact_int(col.iat[i], num.iat[i])
+    return num
 
-    if None in (ts, endpoint, method, rt, status, user, req_bytes, resp_bytes):
+
+def _exact_int(raw: Any, approx: float) -> Any:
+    if isinstance(raw, (int, str)):
+        try:
+            return int(raw)
+        except ValueError:
+            pass
+    return approx
+
+
+def _parse_timestamps(raw: pd.Series) -> pd.Series:
+    # Fixed-format parse first; only rows it rejects go through the
+    # general ISO8601 parser. Non-strings become NaT.
+    raw = raw.where(raw.map(type) == str)
+    ts = _to_ns(pd.to_datetime(raw, format=TIMESTAMP_FORMAT, utc=True, errors="coerce"))
+    slow = ts.isna() & raw.notna()
+    if slow.any():
+        ts = ts.mask(slow, _to_ns(pd.to_datetime(raw[slow], format="ISO8601", utc=True, errors="coerce")))
+    return ts
+
+
+def _to_ns(ts: pd.Series) -> pd.Series:
+    # Timestamps outside the epoch-ns range (years before 1677 or after 2262)
+    # cannot be stored as timestamp_ns; they become NaT and the row is dropped
+    if ts.dt.tz is None:  # pandas 2.x parses an all-NaT column as tz-naive
+        ts = ts.dt.tz_localize("UTC")
+    in_range = (ts >= _MIN_TS) & (ts <= _MAX_TS)
+    return ts.where(in_range).dt.as_unit("ns")
+
+
+def _validate_batch_compiled(batch: List[Any]) -> Optional[pd.DataFrame]:
+    # None when the batch holds values only the pandas validator can decide
+    cols = _fastcore.validate_batch(batch, tuple(REQUIRED_FIELDS))
+    if cols is None:
         return None
+    ts_ns, endpoint, method, user_id, *ints, rows, pending_rows, pending_raw = cols
+    keep = None
+    if pending_rows.size:
+        # Timestamps outside the fixed shape go through the pandas parser
+        parsed = _parse_timestamps(pd.Series(pending_raw, dtype=object))
+        ok = parsed.notna().to_numpy()
+        ts_ns[pending_rows[ok]] = parsed[ok].astype(np.int64).to_numpy()
+        keep = np.ones(ts_ns.size, dtype=bool)
+        keep[pending_rows[~ok]] = False
+    out = pd.DataFrame(
+        {"timestamp_ns": ts_ns, "endpoint": endpoint, "method": method, "user_id": user_id}, index=rows
+    )
+    for f, col in zip(INT_FIELDS, ints):
+        out[f] = col
+    if keep is not None:
+        out = out[keep]
+    out["is_error"] = out["status_code"].between(400, 599)
+    return out[VALIDATED_FIELDS]
+
+
+def _empty_frame() -> pd.DataFrame:
+    cols: Dict[str, Any] = {"timestamp_ns": pd.Series([], dtype=np.int64)}
+    for f in STR_FIELDS:
+        cols[f] = pd.Series([], dtype="category" if f in INTERNED_FIELDS else object)
+    for f in INT_FIELDS:
+        cols[f] = pd.Series([], dtype=np.int64)
+    cols["is_error"] = pd.Series([], dtype=bool)
+    return pd.DataFrame(cols)[VALIDATED_FIELDS]
+
 
-    return {
-        "timestamp": ts,
-        "endpoint": endpoint,
-        "method": method.upper(),
-        "response_time_ms": rt,
-        "status_code": status,
-        "user_id": user,
-        "request_size_bytes": req_bytes,
-        "response_size_bytes": resp_bytes,
-    }
-
-
-def aggregate_by_endpoint(valid_logs: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
-    stats: Dict[str, Dict[str, Any]] = {}
-    for log in valid_logs:
-        ep = log["endpoint"]
-        s = stats.setdefault(
-            ep,
-            {
-                "count": 0,
-                "sum_rt": 0,
-                "slowest": -math.inf,
-                "fastest": math.inf,
-                "error_count": 0,
-                "status_counter": Counter(),
-            },
-        )
-        s["count"] += 1
-        s["sum_rt"] += log["response_time_ms"]
-        s["slowest"] = max(s["slowest"], log["response_time_ms"])
-        s["fastest"] = min(s["fastest"], log["response_time_ms"])
-        if is_error_status(log["status_code"]):
-            s["error_count"] += 1
-        s["status_counter"][log["status_code"]] += 1
-    return stats
+def ns_to_datetime(ns: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(ns) // 1000)
+
+
+def format_ts_ns(ns: int) -> str:
+    # ISO8601 string with "Z" suffix for an epoch-ns UTC timestamp
+    return ns_to_datetime(ns).isoformat().replace("+00:00", "Z")
+
+
+def aggregate_by_endpoint(df: pd.DataFrame) -> pd.DataFrame:
+    # Per-endpoint counts, sums and extremes in one grouped pass over a
+    # validated frame (with is_error). Each column merges across shards by
+    # its own aggregation; statuses are counted separately (status_counts).
+    return df.groupby("endpoint", sort=True, observed=True).agg(
+        count=("response_time_ms", "size"),
+        sum_rt=("response_time_ms", "sum"),
+        min_rt=("response_time_ms", "min"),
+        max_rt=("response_time_ms", "max"),
+        errors=("is_error", "sum"),
+        first_ts=("timestamp_ns", "min"),
+        last_ts=("timestamp_ns", "max"),
+    )
+
+
+def status_counts(df: pd.DataFrame) -> pd.DataFrame:
+    # Requests per (endpoint, status_code) pair, with the input position
+    # (the frame's index) of the pair's first row
+    return (
+        df.assign(row=df.index)
+        .groupby(["endpoint", "status_code"], observed=True)
+        .agg(count=("row", "size"), first_row=("row", "min"))
+        .reset_index()
+    )
+
+
+def most_common_statuses(counts: pd.DataFrame) -> np.ndarray:
+    # Most frequent status per endpoint, in endpoint order. Equal counts go
+    # to the status that appears first in the input, as with
+    # Counter.most_common over the rows in input order.
+    top = counts.sort_values(["count", "first_row"], ascending=[False, True]).drop_duplicates("endpoint")
+    return top.sort_values("endpoint")["status_code"].to_numpy()
+
+
+SEVERITY_LEVELS: Tuple[str, ...] = ("medium", "high", "critical")
+_SEVERITY_LABELS = np.array([None, *SEVERITY_LEVELS], dtype=object)
+
+
+def _threshold_key(thresholds: Dict[str, float]) -> Tuple[float, ...]:
+    # Hashable (medium, high, critical) form of a thresholds dict
+    return tuple(thresholds[level] for level in SEVERITY_LEVELS)
+
+
+def severity_bounds(thresholds: Dict[str, float]) -> np.ndarray:
+    # Ascending bucket boundaries for classify_severity, built once per table
+    return np.asarray(_threshold_key(thresholds), dtype=float)
+
+
+def _severity(value: float, bounds: Tuple[float, ...]) -> Optional[str]:
+    # Label index = number of bounds strictly below value
+    return _SEVERITY_LABELS[bisect_left(bounds, value)]
 
 
 def severity_for_response_time(avg_ms: float, thresholds: Dict[str, int]) -> Optional[str]:
-    if avg_ms > thresholds["critical"]:
-        return "critical"
-    if avg_ms > thresholds["high"]:
-        return "high"
-    if avg_ms > thresholds["medium"]:
-        return "medium"
-    return None
+    return _severity(avg_ms, _threshold_key(thresholds))
 
 
 def severity_for_error_rate(err_rate_percent: float, thresholds: Dict[str, float]) -> Optional[str]:
-    if err_rate_percent > thresholds["critical"]:
-        return "critical"
-    if err_rate_percent > thresholds["high"]:
-        return "high"
-    if err_rate_percent > thresholds["medium"]:
-        return "medium"
-    return None
-
-
-def hourly_bucket(dt: datetime) -> str:
-    # Return "HH:00" in UTC
-    return f"{dt.hour:02d}:00"
-
-
-def sliding_window_counts(
-    timestamps: List[datetime], window_minutes: int
-) -> List[Tuple[datetime, int]]:
-    # timestamps must be sorted
-    counts: List[Tuple[datetime, int]] = []
-    left = 0
-    for right in range(len(timestamps)):
-        start_time = timestamps[right]
-        window_start = start_time - timedelta_minutes(window_minutes)
-        while timestamps[left] < window_start:
-            left += 1
-        counts.append((start_time, right - left + 1))
-    return counts
+    return _severity(err_rate_percent, _threshold_key(thresholds))
+
+
+def classify_severity(values: Any, bounds: np.ndarray) -> np.ndarray:
+    # Vectorized severity: count of bounds strictly below each value,
+    # mapped to None / "medium" / "high" / "critical"
+    return _SEVERITY_LABELS[np.searchsorted(bounds, np.asarray(values, dtype=float), side="left")]
+
+
+def window_sums(minutes: np.ndarray, counts: np.ndarray, starts: np.ndarray, window: int) -> np.ndarray:
+    # Events in minutes [s, s + window) for each start s, given ascending
+    # occupied minutes and their counts. Sparse, so the cost follows the
+    # number of occupied minutes rather than the time span they cover.
+    csum = np.concatenate(([0], np.cumsum(counts)))
+    return csum[np.searchsorted(minutes, starts + window)] - csum[np.searchsorted(minutes, starts)]
 
 
 def timedelta_minutes(m: int):